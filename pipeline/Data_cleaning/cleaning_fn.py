@@ -0,0 +1,273 @@
+import os
+import logging
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from importlib import resources
+
+import torch
+import torchaudio
+import numpy as np
+import soundfile as sf
+import onnxruntime as ort
+from tqdm import tqdm
+
+VAD_SAMPLE_RATE = 16000
+# Silero consumes fixed 512-sample windows at 16 kHz (32 ms each),
+# each prefixed with 64 samples of context from the previous window.
+VAD_WINDOW_SIZE = 512
+VAD_CONTEXT_SIZE = 64
+VAD_STATE_SIZE = 128
+SPEECH_THRESHOLD = 0.5
+
+
+@functools.lru_cache(maxsize=1)
+def _get_vad_session():
+    """
+    Build an onnxruntime session for the Silero VAD model, once per process.
+
+    The .onnx file ships with the silero-vad package, so no hub download
+    is needed. Cached so that repeated trim_with_vad calls (e.g. per
+    subdirectory) reuse the same session instead of paying init each time.
+    """
+    onnx_path = str(resources.files("silero_vad").joinpath("data", "silero_vad.onnx"))
+
+    opts = ort.SessionOptions()
+    opts.intra_op_num_threads = os.cpu_count()
+    opts.inter_op_num_threads = 1
+
+    providers = [
+        p for p in ("CUDAExecutionProvider", "CPUExecutionProvider")
+        if p in ort.get_available_providers()
+    ]
+    return ort.InferenceSession(onnx_path, sess_options=opts, providers=providers)
+
+
+def _iter_wavs(root, ext=".wav"):
+    """Yield paths of all files under root with the given extension.
+
+    Recurses with os.scandir, which reuses the directory entry's cached
+    file type instead of stat-ing every path the way os.walk does.
+    """
+    for entry in os.scandir(root):
+        if entry.is_dir(follow_symlinks=False):
+            yield from _iter_wavs(entry.path, ext)
+        elif entry.name.lower().endswith(ext):
+            yield entry.path
+
+
+def _gather_files(input_dir, output_dir):
+    """
+    Collect (input_path, output_path) pairs for every WAV under input_dir,
+    sorted by clip duration so each VAD batch holds near-uniform lengths
+    and wastes little compute on padding.
+    """
+    pairs = []
+    for input_path in _iter_wavs(input_dir):
+        output_path = os.path.join(output_dir, os.path.relpath(input_path, input_dir))
+        try:
+            # Header-only read; no audio is decoded here.
+            duration = sf.info(input_path).duration
+        except Exception:
+            # Unreadable files sort first and get reported by _load_one.
+            duration = 0.0
+        pairs.append((duration, input_path, output_path))
+    pairs.sort(key=lambda item: item[0])
+    return [(input_path, output_path) for _, input_path, output_path in pairs]
+
+
+def _load_one(input_path, device):
+    """Decode a clip and return (full-rate waveform, sample rate, 16 kHz copy).
+
+    The 16 kHz copy is resampled on `device`, so with a GPU available the
+    resample does not tie up a CPU core per file.
+    """
+    audio_data, sr = sf.read(input_path, dtype="int16", always_2d=False)
+    if audio_data.ndim > 1:
+        audio_data = audio_data.mean(axis=1).astype(np.int16)
+    # Only the VAD copy is converted to float; the full-rate int16 buffer
+    # is sliced and written back out as-is.
+    float_waveform = torch.from_numpy(audio_data).to(device, torch.float32).div_(32768.0)
+    vad_waveform = torchaudio.functional.resample(float_waveform, sr, VAD_SAMPLE_RATE)
+    return audio_data, sr, vad_waveform.cpu().numpy()
+
+
+def _batched_speech_probs(session, vad_waveforms):
+    """
+    Run Silero over a batch of 16 kHz waveforms in one padded pass.
+
+    Returns a (K, n_windows) array of per-window speech probabilities and
+    the number of valid (non-padding) windows per waveform.
+    """
+    lengths = [w.shape[0] for w in vad_waveforms]
+    n_windows = [(length + VAD_WINDOW_SIZE - 1) // VAD_WINDOW_SIZE for length in lengths]
+    padded_len = max(n_windows) * VAD_WINDOW_SIZE
+
+    batch = np.zeros((len(vad_waveforms), padded_len), dtype=np.float32)
+    for i, w in enumerate(vad_waveforms):
+        batch[i, : w.shape[0]] = w
+
+    # Fresh recurrent state and context per batch, as in Silero's own wrapper.
+    state = np.zeros((2, len(vad_waveforms), VAD_STATE_SIZE), dtype=np.float32)
+    context = np.zeros((len(vad_waveforms), VAD_CONTEXT_SIZE), dtype=np.float32)
+    sr_input = np.array(VAD_SAMPLE_RATE, dtype=np.int64)
+
+    probs = []
+    for offset in range(0, padded_len, VAD_WINDOW_SIZE):
+        window = batch[:, offset:offset + VAD_WINDOW_SIZE]
+        out, state = session.run(
+            None,
+            {
+                "input": np.concatenate([context, window], axis=1),
+                "state": state,
+                "sr": sr_input,
+            },
+        )
+        context = window[:, -VAD_CONTEXT_SIZE:]
+        probs.append(out[:, 0])
+    return np.stack(probs, axis=1), n_windows
+
+
+def _speech_bounds(probs, n_windows, min_speech_windows, min_silence_windows):
+    """
+    Threshold one probability stream to (start_window, end_window_exclusive),
+    or None if no speech region survives. Speech runs separated by fewer than
+    min_silence_windows are merged; runs shorter than min_speech_windows are
+    dropped.
+    """
+    speech = (probs[:n_windows] > SPEECH_THRESHOLD).tolist()
+
+    runs = []
+    start = None
+    for i, is_speech in enumerate(speech):
+        if is_speech and start is None:
+            start = i
+        elif not is_speech and start is not None:
+            runs.append([start, i])
+            start = None
+    if start is not None:
+        runs.append([start, len(speech)])
+
+    merged = []
+    for run in runs:
+        if merged and run[0] - merged[-1][1] < min_silence_windows:
+            merged[-1][1] = run[1]
+        else:
+            merged.append(run)
+
+    kept = [run for run in merged if run[1] - run[0] >= min_speech_windows]
+    if not kept:
+        return None
+    return kept[0][0], kept[-1][1]
+
+
+def _export_one(waveform, sr, start_sec, end_sec, output_path):
+    """Slice the full-rate waveform and write it out as 16-bit PCM WAV."""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    start_sample = int(start_sec * sr)
+    end_sample = int(end_sec * sr)
+    sf.write(output_path, waveform[start_sample:end_sample], sr, subtype="PCM_16")
+
+
+def trim_with_vad(
+        input_dir,
+        output_dir,
+        min_speech_duration_ms=250,
+        min_silence_duration_ms=100,
+        max_workers=None,
+        batch_size=None,
+):
+    """
+    Trim leading/trailing non-speech from every WAV file under input_dir
+    using Silero voice activity detection, mirroring the directory
+    structure into output_dir. Clips are decoded and exported concurrently
+    and fed to the VAD in padded batches instead of one at a time.
+
+    Parameters
+    ----------
+    input_dir : str
+        Directory containing the WAV clips to trim (searched recursively).
+    output_dir : str
+        Directory to save the trimmed clips to.
+    min_speech_duration_ms : int
+        Minimum duration (ms) of a speech region; shorter ones are ignored.
+    min_silence_duration_ms : int
+        Minimum duration (ms) of a non-speech gap; shorter ones are filled.
+    max_workers : int, optional
+        Number of I/O worker threads. Defaults to the CPU count.
+    batch_size : int, optional
+        Number of clips per VAD batch. Defaults to 2x the CPU count.
+    """
+    session = _get_vad_session()
+    # The resample still runs through torch, so keep it on GPU when available.
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    if max_workers is None:
+        max_workers = os.cpu_count()
+    if batch_size is None:
+        batch_size = 2 * os.cpu_count()
+
+    window_ms = VAD_WINDOW_SIZE * 1000 // VAD_SAMPLE_RATE
+    min_speech_windows = max(1, min_speech_duration_ms // window_ms)
+    min_silence_windows = max(1, min_silence_duration_ms // window_ms)
+
+    pairs = _gather_files(input_dir, output_dir)
+    progress = tqdm(total=len(pairs))
+    # Failures are collected and reported once at the end; per-file prints
+    # would serialize the worker threads on the stdout lock.
+    failures = deque()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for chunk_start in range(0, len(pairs), batch_size):
+            chunk = pairs[chunk_start:chunk_start + batch_size]
+
+            loaded = []
+            for (input_path, output_path), future in zip(
+                    chunk,
+                    [executor.submit(_load_one, p, device) for p, _ in chunk],
+            ):
+                try:
+                    waveform, sr, vad_waveform = future.result()
+                    loaded.append((input_path, output_path, waveform, sr, vad_waveform))
+                except Exception as e:
+                    failures.append((input_path, e))
+                    progress.update(1)
+
+            if not loaded:
+                continue
+
+            probs, n_windows = _batched_speech_probs(
+                session, [item[4] for item in loaded]
+            )
+
+            export_futures = []
+            for i, (input_path, output_path, waveform, sr, _) in enumerate(loaded):
+                bounds = _speech_bounds(
+                    probs[i], n_windows[i], min_speech_windows, min_silence_windows
+                )
+                if bounds is None:
+                    progress.update(1)
+                    continue
+                start_sec = bounds[0] * VAD_WINDOW_SIZE / VAD_SAMPLE_RATE
+                end_sec = bounds[1] * VAD_WINDOW_SIZE / VAD_SAMPLE_RATE
+                export_futures.append((
+                    input_path,
+                    executor.submit(
+                        _export_one, waveform, sr, start_sec, end_sec, output_path
+                    ),
+                ))
+
+            for input_path, future in export_futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    failures.append((input_path, e))
+                progress.update(1)
+
+    progress.close()
+
+    if failures:
+        logging.warning(f"trim_with_vad: {len(failures)} file(s) failed")
+        for input_path, error in failures:
+            logging.warning(f"  {input_path}: {error}")
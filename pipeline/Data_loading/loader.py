@@ -1,7 +1,8 @@
 import os
 import logging
+import threading
 import wandb
-import pandas as pd
+import polars as pl
 
 
 class DataLoader:
@@ -16,7 +17,7 @@ class DataLoader:
         Parameters
         ----------
         input_dir : str
-            Directory containing Common Voice TSV files 
+            Directory containing Common Voice TSV files
             (train.tsv, test.tsv, dev.tsv, validated.tsv, other.tsv, clip_durations.tsv).
         output_dir : str
             Directory to save the final combined TSV file.
@@ -40,8 +41,8 @@ class DataLoader:
         """
         Main pipeline method for Data Loading:
           - Initialize W&B run
-          - Load and merge all necessary TSV files into one big DataFrame
-          - Optionally merge with clip_durations.tsv
+          - Build one lazy query over all necessary TSV files
+          - Optionally join with clip_durations.tsv
           - Drop duplicates
           - Save single 'complete_data.tsv'
           - Log artifact to W&B (metadata: row count, file size, final path)
@@ -59,53 +60,62 @@ class DataLoader:
         logging.info("Data loading pipeline started.")
 
         # -----------------------------
-        # 2) Gather TSV files
+        # 2) Gather TSV files lazily
         # -----------------------------
         files_to_include = ["train.tsv", "test.tsv", "dev.tsv", "validated.tsv", "other.tsv"]
-        dfs = []
+        # Scans are lazy: the actual reads run file- and chunk-parallel
+        # inside the Polars engine when the plan executes, so no explicit
+        # thread pool is needed here.
+        lazy_frames = []
 
         for filename in files_to_include:
             path = os.path.join(self.input_dir, filename)
             if os.path.isfile(path):
-                logging.info(f"Reading {filename}")
-                df_part = pd.read_csv(path, sep="\t")
-                df_part["source_file"] = filename  # track origin
-                dfs.append(df_part)
+                logging.info(f"Scanning {filename}")
+                lazy_frames.append(
+                    pl.scan_csv(path, separator="\t")
+                    .with_columns(
+                        pl.lit(filename).alias("source_file"),  # track origin
+                        # Categorical keys: dedup and join hash int codes
+                        # instead of repetitive path strings.
+                        pl.col("path").cast(pl.Categorical),
+                    )
+                )
             else:
                 logging.warning(f"{filename} not found in {self.input_dir}, skipping...")
 
-        if not dfs:
+        if not lazy_frames:
             logging.error("No valid TSV files found to merge. Exiting.")
             run.finish()
             return
 
-        combined_df = pd.concat(dfs, ignore_index=True)
-        logging.info(f"Initial combined shape (no durations merged): {combined_df.shape}")
+        combined = pl.concat(lazy_frames, how="vertical_relaxed")
 
         # -----------------------------
-        # 3) Merge with clip_durations (if exists)
+        # 3) Drop duplicates by 'path'
+        # -----------------------------
+        # The splits overlap heavily (e.g. train is a subset of validated),
+        # so dedup before the join to keep its left side small. Because the
+        # plan is sunk to disk via the streaming engine, unique() only keeps
+        # the seen-path state in memory, not the concatenated rows, so peak
+        # memory is bounded by the unique-row count rather than total rows.
+        combined = combined.unique(subset="path", keep="first")
+
+        # -----------------------------
+        # 4) Join with clip_durations (if exists)
         # -----------------------------
         clip_durations_path = os.path.join(self.input_dir, "clip_durations.tsv")
         if os.path.isfile(clip_durations_path):
-            logging.info("Merging clip_durations.tsv")
-            durations_df = pd.read_csv(clip_durations_path, sep="\t")
-            # Standardize column name
-            durations_df.columns = ["path", "duration_ms"]
-            combined_df = pd.merge(combined_df, durations_df, on="path", how="left")
+            logging.info("Joining clip_durations.tsv")
+            durations = pl.scan_csv(clip_durations_path, separator="\t")
+            # Standardize column names
+            old_names = durations.collect_schema().names()
+            durations = durations.rename({old_names[0]: "path", old_names[1]: "duration_ms"})
+            durations = durations.with_columns(pl.col("path").cast(pl.Categorical))
+            combined = combined.join(durations, on="path", how="left")
         else:
             logging.warning("clip_durations.tsv not found. Proceeding without durations.")
 
-        # -----------------------------
-        # 4) Drop duplicates by 'path'
-        # -----------------------------
-        before_drop = len(combined_df)
-        combined_df = combined_df.drop_duplicates(subset="path")
-        after_drop = len(combined_df)
-        logging.info(
-            f"Dropped {before_drop - after_drop} duplicates based on 'path'. "
-            f"Final shape: {combined_df.shape}"
-        )
-
         # -----------------------------
         # 5) Save as complete_data.tsv
         # -----------------------------
@@ -113,8 +123,16 @@ class DataLoader:
         out_filename = "complete_data.tsv"
         out_path = os.path.join(self.output_dir, out_filename)
 
-        combined_df.to_csv(out_path, sep="\t", index=False)
-        logging.info(f"Saved final dataset to: {out_path}")
+        # The whole concat -> unique -> join plan executes here in one
+        # streaming pass, writing rows as they are produced instead of
+        # materializing the full result first. The string cache gives all
+        # inputs a shared categorical index for 'path'.
+        with pl.StringCache():
+            combined.sink_csv(out_path, separator="\t")
+        num_rows = (
+            pl.scan_csv(out_path, separator="\t").select(pl.len()).collect().item()
+        )
+        logging.info(f"Saved final dataset to: {out_path} (Rows: {num_rows})")
 
         # -----------------------------
         # 6) Log artifact to W&B
@@ -129,14 +147,17 @@ class DataLoader:
 
         # Attach metadata
         file_size = os.path.getsize(out_path)  # in bytes
-        num_rows = len(combined_df)
         artifact.metadata = {
             "file_path": out_path,
             "size_bytes": file_size,
             "num_rows": num_rows
         }
 
-        run.log_artifact(artifact)
+        # log_artifact hashes the whole TSV before upload; run it on a side
+        # thread so the hash overlaps with the remaining logging instead of
+        # blocking the caller until run.finish().
+        log_thread = threading.Thread(target=run.log_artifact, args=(artifact,))
+        log_thread.start()
         logging.info(
             f"W&B artifact logged: data_loading (Rows: {num_rows}, Size: {file_size} bytes)"
         )
@@ -144,4 +165,5 @@ class DataLoader:
         # -----------------------------
         # 7) Finish run
         # -----------------------------
+        log_thread.join()
         run.finish()